@@ -1,38 +1,139 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import requests
-import io
+import requests_cache
 import pyodbc
-from sqlalchemy import create_engine, types 
+from sqlalchemy import create_engine, text, types 
 import os
 import time
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    # Optional: native TDS bulk copy through the bcp utility
+    from bcpandas import SqlCreds, to_sql as bcp_to_sql
+except ImportError:
+    bcp_to_sql = None
+
+try:
+    # Optional: columnar Arrow -> ODBC inserts, no per-row Python conversion
+    from arrow_odbc import insert_into_table as arrow_odbc_insert
+except (ImportError, OSError):  # OSError: ODBC driver manager library missing
+    arrow_odbc_insert = None
+
+# Number of concurrent download workers (network-bound, so threads overlap latency)
+DOWNLOAD_WORKERS = 16
+
+# On-disk HTTP cache; responses are revalidated with GitHub's ETag (304 when unchanged)
+HTTP_CACHE_NAME = 'bronze_http_cache'
+
+# Number of tables imported concurrently (each worker holds one pooled connection)
+IMPORT_WORKERS = 4
+
+# Rows per executemany batch (pyodbc fast_executemany binds each chunk as arrays)
+INSERT_CHUNK_SIZE = 10000
+
+# Rows decoded from parquet and inserted per streamed batch
+STREAM_BATCH_SIZE = 50000
+
+# Column name keywords (substring match on the lowercased name) driving SQL type mapping
+AMOUNT_KEYWORDS = frozenset(('amount', 'balance', 'price', 'value'))
+ADDRESS_KEYWORDS = frozenset(('address', 'location'))
+DATE_KEYWORDS = frozenset(('date', 'time'))
+ID_KEYWORDS = frozenset(('id', 'num', 'no', 'code'))
+
+# Leading YYYY-MM-DD of an ISO 8601 date/datetime string
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Rows bound per ODBC round trip on the arrow-odbc path
+ARROW_ODBC_CHUNK_SIZE = 65536
+
+# Local parquet mirror of every Bronze table, for fast re-reads in Silver
+# (one row group per streamed batch, i.e. STREAM_BATCH_SIZE rows)
+BRONZE_PARQUET_DIR = 'bronze'
+
+# Tables larger than this are bulk copied with bcp when bcpandas is installed
+BULK_COPY_THRESHOLD = 100000
+BULK_COPY_BATCH_SIZE = 50000
 
 # -------------------------------
 # Data type mapping from pandas to SQL Server
 # -------------------------------
-def get_sql_data_type(dtype, column_name='', column_data=None):
+def probe_lengths_from_metadata(pf, columns):
+    """Get max string lengths from parquet column statistics where they are exact"""
+    # Statistics hold the lexicographic min/max, not the longest value, so they only
+    # pin the length down for column chunks that are all-null or a single repeated value
+    lengths = {}
+    unresolved = set()
+    for rg in range(pf.num_row_groups):
+        row_group = pf.metadata.row_group(rg)
+        for c in range(row_group.num_columns):
+            chunk = row_group.column(c)
+            column = chunk.path_in_schema
+            if column not in columns or column in unresolved:
+                continue
+            
+            stats = chunk.statistics
+            if stats is None:
+                unresolved.add(column)
+            elif stats.has_null_count and stats.null_count == chunk.num_values:
+                lengths[column] = lengths.get(column, 0)
+            elif (stats.has_min_max and stats.min == stats.max
+                    and getattr(stats, 'is_max_value_exact', True)):
+                lengths[column] = max(lengths.get(column, 0), len(stats.max))
+            else:
+                unresolved.add(column)
+    
+    return {column: length for column, length in lengths.items() if column not in unresolved}
+
+def probe_string_lengths(pf):
+    """Compute max string length for every string column of a parquet file in one pass"""
+    string_columns = [
+        field.name for field in pf.schema_arrow
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+    ]
+    
+    # Footer statistics first; only columns they cannot resolve are scanned
+    lengths = probe_lengths_from_metadata(pf, string_columns)
+    scan_columns = [column for column in string_columns if column not in lengths]
+    if not scan_columns:
+        return lengths
+    
+    # Only string columns are decoded, and lengths come from Arrow's UTF-8 kernel
+    for batch in pf.iter_batches(batch_size=STREAM_BATCH_SIZE, columns=scan_columns):
+        for column, values in zip(batch.schema.names, batch.columns):
+            batch_max = pc.max(pc.utf8_length(values)).as_py()
+            if batch_max is not None:
+                lengths[column] = max(lengths.get(column, 0), batch_max)
+    return lengths
+
+def get_sql_data_type(dtype, column_name='', max_len=None):
     """Map pandas data types to SQL Server data types with dynamic string sizing"""
     dtype_str = str(dtype).lower()
+    name_lower = column_name.lower()
     
     # Currency/amount columns
-    if any(keyword in column_name.lower() for keyword in ['amount', 'balance', 'price', 'value']):
+    if any(keyword in name_lower for keyword in AMOUNT_KEYWORDS):
         return types.DECIMAL(15, 2)
 
     # Currency/amount columns
-    if any(keyword in column_name.lower() for keyword in ['address', 'location']):
+    if any(keyword in name_lower for keyword in ADDRESS_KEYWORDS):
         return types.TEXT()
     
     # Date/time columns
-    if any(keyword in column_name.lower() for keyword in ['date', 'time']):
+    if any(keyword in name_lower for keyword in DATE_KEYWORDS):
         if 'datetime' in dtype_str:
             return types.DATETIME()
         else:
             return types.DATE()
     
     # ID columns
-    if any(keyword in column_name.lower() for keyword in ['id', 'num', 'no', 'code']):
+    if any(keyword in name_lower for keyword in ID_KEYWORDS):
         if 'int' in dtype_str:
             return types.INTEGER()
         else:
@@ -48,100 +149,103 @@ def get_sql_data_type(dtype, column_name='', column_data=None):
     elif 'datetime' in dtype_str:
         return types.DATETIME()
     elif 'object' in dtype_str or 'string' in dtype_str:
-        # Calculate appropriate length for string columns
-        if column_data is not None:
-            try:
-                # Get max length, handling None values
-                max_len = column_data.dropna().astype(str).str.len().max()
-                if pd.isna(max_len) or max_len == 0:
-                    return types.NVARCHAR(500)
-                # Add 20% buffer, min 50, max 4000
-                suggested_len = min(max(int(max_len * 1.2), 50), 4000)
-                return types.NVARCHAR(suggested_len)
-            except Exception as e:
-                print(f"  Warning: Could not calculate length for {column_name}, using default")
-                return types.NVARCHAR(500)
-        return types.NVARCHAR(500)
+        # Size string columns from the pre-computed max length
+        if max_len is None or pd.isna(max_len) or max_len == 0:
+            return types.NVARCHAR(500)
+        # Add 20% buffer, min 50, max 4000
+        suggested_len = min(max(int(max_len * 1.2), 50), 4000)
+        return types.NVARCHAR(suggested_len)
     else:
         return types.NVARCHAR(500)
 
 # -------------------------------
 # Bronze Layer Metadata Functions
 # -------------------------------
-def add_bronze_metadata(df, source_url):
-    """Add bronze layer metadata columns to the dataframe"""
-    df_with_metadata = df.copy()
-    
-    # Add metadata columns
-    df_with_metadata['_source_file_url'] = source_url
-    df_with_metadata['_ingestion_timestamp'] = pd.Timestamp.now('UTC')
-    df_with_metadata['_source_hash'] = generate_source_hash(df)
+def add_bronze_metadata(df, source_hash):
+    """Add bronze layer metadata columns to the dataframe (in place)"""
+    # _source_file_url and _ingestion_timestamp are column DEFAULTs (see create_table),
+    # so only the hash travels with the rows
+    df['_source_hash'] = source_hash
     
-    return df_with_metadata
+    return df
 
-def generate_source_hash(df):
-    """Generate a hash of the source data for change detection"""
-    # Create a string representation of the entire dataframe (without metadata columns)
-    data_string = df.astype(str).to_string(index=False).encode('utf-8')
-    
-    # Generate hash
-    return hashlib.md5(data_string).hexdigest()
+def generate_source_hash(content):
+    """Generate a hash of the source parquet file for change detection"""
+    # Hashing the file bytes needs no decode, so it is known before the first batch
+    # SHA-256 (hardware accelerated by OpenSSL), truncated to 128 bits / 32 hex chars
+    return hashlib.sha256(content).hexdigest()[:32]
 
-def get_sql_data_type_with_metadata(dtype, column_name='', column_data=None):
+def get_sql_data_type_with_metadata(dtype, column_name='', max_len=None):
     """Updated data type mapping that includes bronze metadata columns"""
     # Handle bronze metadata columns specifically
-    if column_name == '_source_file_url':
-        return types.NVARCHAR(1000)  # Long enough for URLs
-    elif column_name == '_ingestion_timestamp':
-        return types.DATETIME()
-    elif column_name == '_source_hash':
-        return types.NVARCHAR(32)  # MD5 hash length
+    if column_name == '_source_hash':
+        return types.NVARCHAR(32)  # SHA-256/128 hash length
     
     # Use your existing logic for other columns
-    return get_sql_data_type(dtype, column_name, column_data)
+    return get_sql_data_type(dtype, column_name, max_len)
+
+def build_dtype_mapping(df, string_lengths):
+    """Map every dataframe column to its SQL Server data type"""
+    dtype_mapping = {}
+    for column in df.columns:
+        dtype_mapping[column] = get_sql_data_type_with_metadata(
+            df[column].dtype, 
+            column,
+            string_lengths.get(column)
+        )
+    return dtype_mapping
 
 # -------------------------------
 # Data preprocessing function
 # -------------------------------
 def preprocess_dataframe(df, table_name):
-    """Preprocess dataframe to handle problematic data types for SQL Server compatibility"""
-    df = df.copy()
+    """Preprocess dataframe to handle problematic data types for SQL Server compatibility (in place)"""
+    # Convert boolean columns to int (0/1) for SQL Server BIT compatibility (nulls kept)
+    bool_columns = df.select_dtypes(include=['bool', 'boolean']).columns
+    if len(bool_columns):
+        df[bool_columns] = df[bool_columns].astype('Int64')
     
-    # Convert boolean columns to int (0/1) for SQL Server BIT compatibility
-    bool_columns = df.select_dtypes(include=['bool']).columns
-    for col in bool_columns:
-        df[col] = df[col].astype('int64')
+    # Handle date columns in object format (columns already datetime64 are left alone)
+    for col in df.columns:
+        if not pd.api.types.is_string_dtype(df[col].dtype):
+            continue
+        if not any(keyword in col.lower() for keyword in DATE_KEYWORDS):
+            continue
+        
+        # ISO 8601 strings use pandas' fast C parser; anything else keeps the generic parser
+        first_valid = df[col].first_valid_index()
+        if first_valid is not None and ISO_DATE_PATTERN.match(str(df[col].at[first_valid])):
+            date_format = 'ISO8601'
+        else:
+            date_format = None
+        # utc=True accepts mixed offsets, so every batch lands as datetime (made naive below)
+        df[col] = pd.to_datetime(
+            df[col], errors='coerce', format=date_format, utc=True, cache=True
+        )
     
-    # Handle datetime columns - remove timezone info and handle NaT
+    # Handle timezone-aware columns - normalise to naive UTC (NaT is inserted as NULL)
+    # (per column: DataFrame.apply skips the function on an empty frame)
+    for col in df.select_dtypes(include=['datetimetz']).columns:
+        df[col] = df[col].dt.tz_convert('UTC').dt.tz_localize(None)
+    
+    # One datetime resolution for every batch, whatever unit the parser picked
     datetime_columns = df.select_dtypes(include=['datetime64']).columns
-    for col in datetime_columns:
-        if df[col].dtype.kind == 'M':
-            # Convert timezone-aware to timezone-naive
-            if hasattr(df[col].dt, 'tz') and df[col].dt.tz is not None:
-                df[col] = df[col].dt.tz_localize(None)
-            # Replace NaT with None for SQL Server compatibility
-            df[col] = df[col].where(pd.notna(df[col]), None)
-    
-    # Handle date columns in object format
-    for col in df.columns:
-        if any(keyword in col.lower() for keyword in ['date', 'time']):
-            if df[col].dtype == 'object':
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                    if hasattr(df[col].dt, 'tz') and df[col].dt.tz is not None:
-                        df[col] = df[col].dt.tz_localize(None)
-                    df[col] = df[col].where(pd.notna(df[col]), None)
-                except:
-                    pass
+    if len(datetime_columns):
+        df[datetime_columns] = df[datetime_columns].astype('datetime64[us]')
     
     return df
 
 # -------------------------------
 # Improved download function with retry logic
 # -------------------------------
-def download_with_retry(url, max_retries=3, initial_delay=5):
-    """Download with retry logic for network issues"""
-    session = requests.Session()
+def create_http_session(max_retries=3, pool_size=DOWNLOAD_WORKERS):
+    """Create a cached HTTP session with retry logic, pooled for concurrent downloads"""
+    # cache_control honours Cache-Control/ETag, so repeat runs only pay a conditional GET
+    session = requests_cache.CachedSession(
+        HTTP_CACHE_NAME,
+        backend='sqlite',
+        cache_control=True
+    )
     
     retry_strategy = Retry(
         total=max_retries,
@@ -150,9 +254,19 @@ def download_with_retry(url, max_retries=3, initial_delay=5):
         backoff_factor=1
     )
     
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
+    return session
+
+def download_with_retry(url, max_retries=3, initial_delay=5, session=None):
+    """Download with retry logic for network issues"""
+    if session is None:
+        session = create_http_session(max_retries)
     
     for attempt in range(max_retries):
         try:
@@ -170,36 +284,339 @@ def download_with_retry(url, max_retries=3, initial_delay=5):
             else:
                 raise e
 
-def download_parquet_file(url):
-    """Download and parse parquet file with error handling"""
+# Nullable pandas dtypes, so a batch's dtype never depends on whether it holds nulls
+NULLABLE_DTYPES = {
+    pa.bool_(): pd.BooleanDtype(),
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.uint8(): pd.UInt8Dtype(),
+    pa.uint16(): pd.UInt16Dtype(),
+    pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype(),
+}
+
+def arrow_types_mapper(pa_type):
+    """Keep string columns Arrow-backed and bool/int columns nullable; others use numpy dtypes"""
+    if pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type):
+        return pd.ArrowDtype(pa_type)
+    return NULLABLE_DTYPES.get(pa_type)
+
+def open_parquet_file(content):
+    """Open parquet bytes for batch streaming (only the footer is parsed)"""
+    # BufferReader wraps the bytes without copying them into a BytesIO
+    return pq.ParquetFile(pa.BufferReader(content))
+
+def download_parquet_file(url, session=None):
+    """Download parquet file and validate its footer, returning the raw bytes"""
     try:
-        response = download_with_retry(url)
-        
-        # Try different parquet engines
-        for engine in [None, 'pyarrow', 'fastparquet']:
-            try:
-                df = pd.read_parquet(io.BytesIO(response.content), engine=engine)
-                return df, True
-            except Exception as e:
-                continue
-        return None, False
-                    
+        response = download_with_retry(url, session=session)
     except Exception as e:
         print(f"  Download error: {str(e)}")
         return None, False
+    
+    # Single explicit engine (pyarrow): report a bad file instead of retrying other parsers
+    content = response.content
+    try:
+        open_parquet_file(content)
+    except pa.ArrowException as e:
+        print(f"  Invalid parquet file {os.path.basename(url)} ({len(content)} bytes): {type(e).__name__}: {str(e)}")
+        return None, False
+    
+    return content, True
+
+def download_datasets(data_urls, max_workers=DOWNLOAD_WORKERS):
+    """Download parquet files concurrently, keeping results in data_urls order"""
+    session = create_http_session(pool_size=max_workers)
+    
+    def fetch(url):
+        print(f"  Downloading: {os.path.basename(url)}")
+        return download_parquet_file(url, session)
+    
+    datasets = []
+    failed_downloads = []
+    
+    # One shared session so workers reuse pooled TCP/TLS connections
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for url, (content, success) in zip(data_urls, executor.map(fetch, data_urls)):
+            filename = os.path.basename(url)
+            if success:
+                table_name = (
+                    f"crm_{filename.replace('.parquet', '')}" 
+                    if 'customers' in filename
+                    else f"erp_{filename.replace('.parquet', '')}"
+                )
+                # Store tuple with (table_name, parquet bytes, source_url)
+                datasets.append((table_name, content, url))
+                print(f"   Downloaded: {filename} ({len(content) / 1e6:.1f} MB)")
+            else:
+                failed_downloads.append(url)
+                print(f"   Failed: {filename}")
+    
+    return datasets, failed_downloads
+
+# -------------------------------
+# Table import functions
+# -------------------------------
+def create_table(df, table_name, engine, schema, dtype_mapping, source_url, ingestion_timestamp):
+    """Create (or replace) an empty table with the mapped SQL Server data types"""
+    data_columns = [column for column in df.columns if column != '_source_hash']
+    df.head(0)[data_columns].to_sql(
+        table_name, engine, schema=schema, 
+        if_exists="replace", index=False, 
+        dtype={column: dtype_mapping[column] for column in data_columns}
+    )
+    
+    # Load-constant metadata as column DEFAULTs, so it is never sent over the wire per row.
+    # Metadata columns keep their original order (url, timestamp, hash last): Silver
+    # staging procedures copy Bronze tables positionally with SELECT *
+    source_url_literal = source_url.replace("'", "''")
+    ingestion_literal = ingestion_timestamp.tz_localize(None).isoformat()
+    source_hash_type = dtype_mapping['_source_hash'].compile(dialect=engine.dialect)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"""
+            ALTER TABLE [{schema}].[{table_name}] ADD
+                _source_file_url NVARCHAR(1000) NOT NULL DEFAULT N'{source_url_literal}',
+                _ingestion_timestamp DATETIME2 NOT NULL DEFAULT '{ingestion_literal}',
+                _source_hash {source_hash_type} NULL
+        """)
+
+def insert_rows(df, table_name, engine, schema):
+    """Insert rows into an existing table with pyodbc fast_executemany"""
+    # Plain parameterised INSERT on a raw cursor, bypassing SQLAlchemy's insertmanyvalues
+    columns = ", ".join(f"[{column}]" for column in df.columns)
+    placeholders = ", ".join("?" for _ in df.columns)
+    insert_sql = f"INSERT INTO [{schema}].[{table_name}] ({columns}) VALUES ({placeholders})"
+    
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.fast_executemany = True
+        for start in range(0, len(df), INSERT_CHUNK_SIZE):
+            chunk = df.iloc[start:start + INSERT_CHUNK_SIZE]
+            # Python scalars with None for NULL (NaN, NaT and pd.NA are not valid ODBC params)
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            cursor.executemany(insert_sql, list(chunk.itertuples(index=False, name=None)))
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+def dataframe_to_arrow(df):
+    """Convert a processed batch to an Arrow table"""
+    # Arrow-backed and numeric columns convert without copying
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    
+    # All-null columns have no usable Arrow type, treat them as (NULL) strings
+    return table.cast(pa.schema([
+        field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+        for field in table.schema
+    ]))
+
+def insert_arrow_batch(df, table_name, schema, server, database):
+    """Insert rows into an existing table by binding Arrow column buffers over ODBC"""
+    table = dataframe_to_arrow(df)
+    arrow_odbc_insert(
+        reader=table.to_reader(),
+        chunk_size=ARROW_ODBC_CHUNK_SIZE,
+        table=f"{schema}.{table_name}",
+        connection_string=build_connection_string(server, database)
+    )
+
+def choose_load_method(num_rows):
+    """Pick the fastest available insert path for a table"""
+    if arrow_odbc_insert is not None:
+        return "arrow-odbc"
+    if bcp_to_sql is not None and num_rows > BULK_COPY_THRESHOLD:
+        return "bcp bulk copy"
+    return "fast_executemany"
+
+def write_batch(df, table_name, engine, schema, server, database, load_method):
+    """Append one batch of rows to an existing table"""
+    if load_method == "arrow-odbc":
+        insert_arrow_batch(df, table_name, schema, server, database)
+    elif load_method == "bcp bulk copy":
+        bcp_to_sql(
+            df, table_name, SqlCreds(server, database), schema=schema, 
+            index=False, if_exists="append", 
+            batch_size=BULK_COPY_BATCH_SIZE
+        )
+    else:
+        insert_rows(df, table_name, engine, schema)
+
+def parquet_mirror_path(table_name):
+    """Path of the Bronze parquet mirror of a table"""
+    return os.path.join(BRONZE_PARQUET_DIR, f"{table_name}.parquet")
+
+def build_mirror_schema(source_schema):
+    """Arrow schema of the parquet mirror: the source file's schema plus _source_hash"""
+    return source_schema.append(pa.field('_source_hash', pa.string()))
+
+def mirror_record_batch(batch, source_hash):
+    """Raw source record batch with the _source_hash column, as stored in the mirror"""
+    return batch.append_column(
+        '_source_hash', pa.array([source_hash] * batch.num_rows, type=pa.string())
+    )
+
+def open_parquet_mirror(table_name, arrow_schema, source_url, ingestion_timestamp):
+    """Open a zstd parquet writer for the Bronze mirror of a table"""
+    os.makedirs(BRONZE_PARQUET_DIR, exist_ok=True)
+    
+    # Load-constant metadata goes in the file's key-value metadata instead of columns
+    metadata = dict(arrow_schema.metadata or {})
+    metadata[b'_source_file_url'] = source_url.encode('utf-8')
+    metadata[b'_ingestion_timestamp'] = ingestion_timestamp.isoformat().encode('utf-8')
+    arrow_schema = arrow_schema.with_metadata(metadata)
+    
+    # Written to a temporary name and renamed on success, so readers never see partial files
+    return pq.ParquetWriter(
+        f"{parquet_mirror_path(table_name)}.tmp",
+        arrow_schema,
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=True
+    )
+
+def discard_parquet_mirror(mirror, table_name):
+    """Close and delete an unfinished parquet mirror"""
+    if mirror is not None:
+        try:
+            mirror.close()
+        except Exception:
+            pass
+    tmp_path = f"{parquet_mirror_path(table_name)}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+def write_mirror_batch(mirror, batch, table_name):
+    """Append a batch to the parquet mirror; a failure drops the mirror, never the SQL load"""
+    try:
+        mirror.write_batch(batch)
+        return mirror
+    except Exception as e:
+        print(f"  Warning: Parquet mirror of {table_name} dropped: {str(e)[:150]}")
+        discard_parquet_mirror(mirror, table_name)
+        return None
+
+def prepare_batch(batch, table_name, source_hash):
+    """Convert a parquet record batch to a preprocessed dataframe with Bronze metadata"""
+    df = batch.to_pandas(types_mapper=arrow_types_mapper, split_blocks=True)
+    df = add_bronze_metadata(df, source_hash)
+    
+    # Preprocess batch (keep original data types for bronze!)
+    # Note: We're only preprocessing for SQL compatibility, NOT changing data types yet
+    return preprocess_dataframe(df, table_name)
+
+def import_dataset(table_name, content, source_url, engine, schema, server, database, stored_hash=None):
+    """Stream one parquet file into its Bronze table, returning (rows, load method)"""
+    print(f"Processing: {schema}.{table_name}...")
+    pf = open_parquet_file(content)
+    
+    # STEP 1: Bronze layer metadata, fixed for the whole table
+    source_hash = generate_source_hash(content)
+    ingestion_timestamp = pd.Timestamp.now('UTC')
+    
+    # Unchanged source that is already fully loaded and mirrored: nothing to do (load method None).
+    # The exact row count guards against a table left half-loaded by a failed run; it is
+    # only taken on a hash match, so changed tables are never scanned
+    if (stored_hash == source_hash
+            and os.path.exists(parquet_mirror_path(table_name))
+            and count_table_rows(engine, schema, table_name) == pf.metadata.num_rows):
+        return pf.metadata.num_rows, None
+    
+    # arrow-odbc when installed, else bcp for large tables, else fast_executemany
+    load_method = choose_load_method(pf.metadata.num_rows)
+    
+    # STEP 2: Probe string lengths for the whole file before creating the table
+    string_lengths = probe_string_lengths(pf)
+    
+    # STEP 3: Data type mapping and table from the file schema, not from any one batch.
+    # Batch dtypes do not depend on the values, so every batch conforms to this mapping
+    template = prepare_batch(
+        pa.RecordBatch.from_pylist([], schema=pf.schema_arrow), table_name, source_hash
+    )
+    dtype_mapping = build_dtype_mapping(template, string_lengths)
+    create_table(
+        template, table_name, engine, schema, dtype_mapping, 
+        source_url, ingestion_timestamp
+    )
+    
+    # STEP 4: Parquet mirror of the raw source batches, before any SQL compatibility
+    # preprocessing, so Silver reads Bronze dtypes (optional, never fails the load)
+    try:
+        mirror = open_parquet_mirror(
+            table_name, build_mirror_schema(pf.schema_arrow), 
+            source_url, ingestion_timestamp
+        )
+    except Exception as e:
+        print(f"  Warning: Could not open parquet mirror for {table_name}: {str(e)[:150]}")
+        mirror = None
+    
+    rows = 0
+    try:
+        for batch in pf.iter_batches(batch_size=STREAM_BATCH_SIZE):
+            df = prepare_batch(batch, table_name, source_hash)
+            
+            # STEP 5: Import batch to Bronze layer and its parquet mirror
+            write_batch(df, table_name, engine, schema, server, database, load_method)
+            if mirror is not None:
+                mirror = write_mirror_batch(
+                    mirror, mirror_record_batch(batch, source_hash), table_name
+                )
+            rows += len(df)
+    except Exception:
+        discard_parquet_mirror(mirror, table_name)
+        raise
+    
+    if mirror is not None:
+        try:
+            mirror.close()
+            os.replace(f"{parquet_mirror_path(table_name)}.tmp", parquet_mirror_path(table_name))
+        except Exception as e:
+            print(f"  Warning: Could not finish parquet mirror for {table_name}: {str(e)[:150]}")
+            discard_parquet_mirror(None, table_name)
+    return rows, load_method
 
 # -------------------------------
 # Database setup
 # -------------------------------
+def build_connection_string(server, database):
+    """Build the ODBC connection string (Windows authentication)"""
+    return (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={server};"
+        f"DATABASE={database};"
+        f"Trusted_Connection=yes;"
+    )
+
+def get_stored_source_hashes(engine, schema):
+    """Read the _source_hash of every Bronze table already in the schema"""
+    hashes = {}
+    with engine.connect() as connection:
+        table_names = connection.execute(text("""
+            SELECT TABLE_NAME FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = :schema AND COLUMN_NAME = '_source_hash'
+        """), {"schema": schema}).scalars().all()
+        
+        for table_name in table_names:
+            # The hash is constant within a load, so any one row has it
+            hashes[table_name] = connection.execute(text(
+                f"SELECT TOP 1 _source_hash FROM [{schema}].[{table_name}]"
+            )).scalar()
+    return hashes
+
+def count_table_rows(engine, schema, table_name):
+    """Exact row count of a table"""
+    with engine.connect() as connection:
+        return connection.execute(text(
+            f"SELECT COUNT_BIG(*) FROM [{schema}].[{table_name}]"
+        )).scalar()
+
 def setup_database(server, database, schema):
     """Create database and schema if they don't exist"""
     try:
-        conn_str = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={server};"
-            f"DATABASE=master;"
-            f"Trusted_Connection=yes;"
-        )
+        conn_str = build_connection_string(server, "master")
         conn = pyodbc.connect(conn_str, autocommit=True)
         cursor = conn.cursor()
 
@@ -257,26 +674,7 @@ def main():
     
     # Download datasets
     print(f"Downloading {len(data_urls)} datasets...")
-    datasets = []
-    failed_downloads = []
-
-    for url in data_urls:
-        filename = os.path.basename(url)
-        print(f"  Downloading: {filename}")
-        df, success = download_parquet_file(url)
-        
-        if success:
-            table_name = (
-                f"crm_{filename.replace('.parquet', '')}" 
-                if 'customers' in filename
-                else f"erp_{filename.replace('.parquet', '')}"
-            )
-            # Store tuple with (table_name, dataframe, source_url)
-            datasets.append((table_name, df, url))
-            print(f"   Downloaded: {filename} ({df.shape[0]} rows, {df.shape[1]} columns)")
-        else:
-            failed_downloads.append(url)
-            print(f"   Failed: {filename}")
+    datasets, failed_downloads = download_datasets(data_urls)
 
     if not datasets:
         print("No data downloaded. Exiting.")
@@ -295,7 +693,10 @@ def main():
     # Create SQLAlchemy engine
     try:
         engine = create_engine(
-            f"mssql+pyodbc://@{server}/{database}?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes"
+            f"mssql+pyodbc://@{server}/{database}?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes",
+            fast_executemany=True,
+            pool_size=2 * IMPORT_WORKERS,
+            max_overflow=0
         )
     except Exception as e:
         print(f"ERROR: SQLAlchemy engine creation failed: {str(e)}")
@@ -304,52 +705,41 @@ def main():
     # Import data to SQL Server with Bronze metadata
     print(f"\nImporting data to SQL Server with Bronze layer metadata...")
     successful_imports = 0
+    skipped_imports = 0
     failed_imports = []
 
-    for table_name, df, source_url in datasets:
-        full_table_name = f"{schema}.{table_name}"
+    # Source hashes of previous loads, to skip tables whose source is unchanged
+    try:
+        stored_hashes = get_stored_source_hashes(engine, schema)
+    except Exception as e:
+        print(f"  Warning: Could not read stored source hashes, importing all tables")
+        stored_hashes = {}
+
+    # Each table is independent: overlap preprocessing of one with inserts of another
+    with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                import_dataset, table_name, content, source_url, 
+                engine, schema, server, database, 
+                stored_hashes.get(table_name)
+            ): f"{schema}.{table_name}"
+            for table_name, content, source_url in datasets
+        }
         
-        try:
-            print(f"Processing: {full_table_name}...")
-            
-            # STEP 1: Add Bronze layer metadata
-            df_with_metadata = add_bronze_metadata(df, source_url)
-            print(f"   Added Bronze metadata columns")
-            
-            # STEP 2: Preprocess dataframe (keep original data types for bronze!)
-            df_processed = preprocess_dataframe(df_with_metadata, table_name)
-            # Note: We're only preprocessing for SQL compatibility, NOT changing data types yet
-            
-            # STEP 3: Create data type mapping
-            dtype_mapping = {}
-            for column in df_processed.columns:
-                dtype_mapping[column] = get_sql_data_type_with_metadata(
-                    df_processed[column].dtype, 
-                    column,
-                    df_processed[column]
-                )
-            
-            # STEP 4: Import to Bronze layer
-            if len(df_processed) > 100000:
-                df_processed.to_sql(
-                    table_name, engine, schema=schema, 
-                    if_exists="replace", index=False, 
-                    chunksize=10000, dtype=dtype_mapping
-                )
-            else:
-                df_processed.to_sql(
-                    table_name, engine, schema=schema, 
-                    if_exists="replace", index=False, 
-                    dtype=dtype_mapping
-                )
-            
-            successful_imports += 1
-            print(f"   Imported to Bronze: {full_table_name} ({df_processed.shape[0]} rows)")
-            
-        except Exception as e:
-            failed_imports.append((full_table_name, str(e)))
-            print(f"   Failed: {full_table_name}")
-            print(f"    Error: {str(e)[:200]}")
+        for future in as_completed(futures):
+            full_table_name = futures[future]
+            try:
+                rows, load_method = future.result()
+                successful_imports += 1
+                if load_method is None:
+                    skipped_imports += 1
+                    print(f"   Unchanged, skipped: {full_table_name} ({rows} rows)")
+                else:
+                    print(f"   Imported to Bronze: {full_table_name} ({rows} rows, {load_method})")
+            except Exception as e:
+                failed_imports.append((full_table_name, str(e)))
+                print(f"   Failed: {full_table_name}")
+                print(f"    Error: {str(e)[:200]}")
 
     # Final summary
     print(f"\n" + "="*60)
@@ -357,6 +747,7 @@ def main():
     print("="*60)
     print(f"Successful downloads: {len(datasets)}/{len(data_urls)}")
     print(f"Successful imports: {successful_imports}/{len(datasets)}")
+    print(f"Skipped (source unchanged): {skipped_imports}")
     
     if failed_downloads:
         print(f"\nFailed downloads ({len(failed_downloads)}):")
@@ -371,8 +762,8 @@ def main():
     
     # Display Bronze layer structure info
     print(f"\nBronze Layer Implementation:")
-    print(f"   Added _source_file_url column")
-    print(f"   Added _ingestion_timestamp column") 
+    print(f"   Added _source_file_url column (column DEFAULT)")
+    print(f"   Added _ingestion_timestamp column (column DEFAULT)") 
     print(f"   Added _source_hash column for change detection")
     print(f"   Preserved original source data types")
     print(f"   All data stored in '{schema}' schema")